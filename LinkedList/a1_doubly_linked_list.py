@@ -0,0 +1,465 @@
+"""CSC111 Linked Lists: doubly linked lists with sentinels
+
+A DoublyLinkedList links every node to both its neighbours, and starts and ends with two
+sentinel nodes (_header and _trailer) that never store an item. Because every real node
+always has a node on each side, unlinking or relinking a node never has to search for its
+predecessor or special-case the front and back of the list: given the node itself, each of
+these operations takes O(1) time.
+
+The nodes of a DoublyLinkedList are handed out as "node handles" (by find, node_at and
+nodes) so that client code can remove or move a node it has already located. A handle
+stays attached to the same item until that node is removed from the list. Handles
+compare and hash by identity, so they can be kept in sets and dicts.
+
+DoublyLinkedList provides the same methods as LinkedList, but is deliberately *not* a
+subclass of it: it has no _first attribute, and its last node links to the trailer
+sentinel rather than to None, so code that walks LinkedList._first (such as
+a1_part2.draw_list) cannot be used with it.
+"""
+from __future__ import annotations
+import random
+import timeit
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+from a1_linked_list import LinkedList
+
+
+@dataclass(eq=False)
+class DoublyNode:
+    """A node in a doubly linked list, handed to client code as a node handle.
+
+    Nodes are compared and hashed by identity, and their repr shows only their item.
+
+    Instance Attributes:
+      - item: The data stored in this node.
+      - next: The next node in the list, if any.
+      - prev: The previous node in the list, if any.
+    """
+    item: Any
+    next: Optional[DoublyNode] = field(default=None, repr=False)
+    prev: Optional[DoublyNode] = field(default=None, repr=False)
+
+
+class DoublyLinkedList:
+    """A doubly linked implementation of the List ADT, with header and trailer sentinels.
+
+    >>> lst = DoublyLinkedList([1, 2, 3, 4])
+    >>> node = lst.find(3)
+    >>> lst.move_to_front(node)
+    >>> lst.to_list()
+    [3, 1, 2, 4]
+    >>> list(reversed(lst))
+    [4, 2, 1, 3]
+    >>> node
+    DoublyNode(item=3)
+    >>> lst.remove_node(node)
+    3
+    >>> lst.to_list()
+    [1, 2, 4]
+
+    Representation Invariants:
+        - self._header.prev is None and self._trailer.next is None
+        - for every node n between the sentinels, n.prev.next is n and n.next.prev is n
+        - self._size == number of nodes strictly between the sentinels
+    """
+    # Private Class Attributes:
+    #   - _node_type: the type of node created by append.
+    # Private Instance Attributes:
+    #   - _header: The sentinel node before the first item.
+    #   - _trailer: The sentinel node after the last item.
+    #   - _size: The number of items in this list.
+    _node_type: type = DoublyNode
+    _header: DoublyNode
+    _trailer: DoublyNode
+    _size: int
+
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
+        """
+        self._header = self._node_type(None)
+        self._trailer = self._node_type(None, prev=self._header)
+        self._header.next = self._trailer
+        self._size = 0
+        for item in items:
+            self.append(item)
+
+    def _link_before(self, node: DoublyNode, successor: DoublyNode) -> None:
+        """Link the detached node immediately before successor.
+
+        Preconditions:
+            - node.prev is None and node.next is None
+            - successor is self._trailer or successor is a node in this list
+        """
+        node.prev, node.next = successor.prev, successor
+        successor.prev.next = node
+        successor.prev = node
+        self._size += 1
+
+    def _unlink(self, node: DoublyNode) -> None:
+        """Detach node from this list.
+
+        Preconditions:
+            - node is a (non-sentinel) node in this list
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        self._size -= 1
+
+    def nodes(self) -> Iterator[DoublyNode]:
+        """Return an iterator over the node handles of this list, from front to back.
+        """
+        curr = self._header.next
+        while curr is not self._trailer:
+            yield curr
+            curr = curr.next
+
+    def find(self, item: Any) -> Optional[DoublyNode]:
+        """Return the node handle of the first occurrence of item, or None if there is none.
+        """
+        curr = self._header.next
+        while curr is not self._trailer:
+            if curr.item == item:
+                return curr
+            curr = curr.next
+        return None
+
+    def node_at(self, i: int) -> DoublyNode:
+        """Return the node handle at index i.
+
+        The list is walked from whichever end is closer to index i.
+
+        Raise an IndexError if index i is out of bounds (including if i < 0).
+
+        >>> DoublyLinkedList([10, 20, 30]).node_at(-1)
+        Traceback (most recent call last):
+        IndexError
+        """
+        if not 0 <= i < self._size:
+            raise IndexError
+
+        if i < self._size // 2:
+            curr = self._header.next
+            for _ in range(i):
+                curr = curr.next
+        else:
+            curr = self._trailer.prev
+            for _ in range(self._size - 1 - i):
+                curr = curr.prev
+
+        return curr
+
+    def remove_node(self, node: DoublyNode) -> Any:
+        """Remove node from this list in O(1) time and return its item.
+
+        Raise ValueError if node has already been removed.
+
+        Preconditions:
+            - node was obtained from this list
+        """
+        if node.prev is None:
+            raise ValueError('node is not in a list')
+
+        self._unlink(node)
+        return node.item
+
+    def move_before(self, node: DoublyNode, successor: DoublyNode) -> None:
+        """Move node so that it is immediately before successor, in O(1) time.
+
+        Preconditions:
+            - node and successor are nodes in this list
+        """
+        if node is not successor and node.next is not successor:
+            self._unlink(node)
+            self._link_before(node, successor)
+
+    def move_to_front(self, node: DoublyNode) -> None:
+        """Move node to the front of this list, in O(1) time.
+
+        Preconditions:
+            - node is a node in this list
+        """
+        self.move_before(node, self._header.next)
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items of this linked list, from front to back.
+        """
+        for node in self.nodes():
+            yield node.item
+
+    def __reversed__(self) -> Iterator:
+        """Return an iterator over the items of this linked list, from back to front.
+
+        >>> list(reversed(DoublyLinkedList([1, 2, 3])))
+        [3, 2, 1]
+        """
+        curr = self._trailer.prev
+        while curr is not self._header:
+            yield curr.item
+            curr = curr.prev
+
+    def to_list(self) -> list:
+        """Return a built-in Python list containing the items of this linked list.
+
+        The items in this linked list appear in the same order in the returned list.
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+
+        >>> len(DoublyLinkedList([]))
+        0
+        >>> len(DoublyLinkedList([1, 2, 3]))
+        3
+        """
+        return self._size
+
+    def access(self, node: DoublyNode) -> None:
+        """Apply this list's search heuristic to node, as if __contains__ had just found it.
+
+        DoublyLinkedList has no heuristic, so this does nothing. Subclasses override it
+        so that callers holding a node handle can skip the search in __contains__.
+
+        Preconditions:
+            - node is a node in this list
+        """
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether item is in this linked list.
+
+        If the item is found, apply this list's search heuristic to its node.
+        """
+        node = self.find(item)
+
+        if node is None:
+            return False
+        else:
+            self.access(node)
+            return True
+
+    def __getitem__(self, i: int) -> Any:
+        """Return the item stored at index i in this linked list.
+
+        Raise an IndexError if index i is out of bounds.
+
+        Preconditions:
+            - i >= 0
+        """
+        return self.node_at(i).item
+
+    def pop(self, i: int) -> Any:
+        """Remove and return the item at index i.
+
+        Raise IndexError if i >= len(self).
+
+        Preconditions:
+            - i >= 0
+
+        >>> lst = DoublyLinkedList([1, 2, 10, 200])
+        >>> lst.pop(1)
+        2
+        >>> lst.to_list()
+        [1, 10, 200]
+        """
+        return self.remove_node(self.node_at(i))
+
+    def append(self, item: Any) -> None:
+        """Add the given item to the end of this linked list, in O(1) time.
+        """
+        self._link_before(self._node_type(item), self._trailer)
+
+
+################################################################################
+# Heuristic 1 (move to front)
+################################################################################
+class DoublyMoveToFrontLinkedList(DoublyLinkedList):
+    """A doubly linked list that uses a "move to front" heuristic for searches.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+    """
+
+    def access(self, node: DoublyNode) -> None:
+        """Move node to the front of this list.
+
+        >>> linky = DoublyMoveToFrontLinkedList([10, 20, 30, 40, 50, 60])
+        >>> linky.__contains__(40)
+        True
+        >>> linky.to_list()
+        [40, 10, 20, 30, 50, 60]
+        >>> linky.__contains__(65)
+        False
+        """
+        self.move_to_front(node)
+
+
+################################################################################
+# Heuristic 2 (swap)
+################################################################################
+class DoublySwapLinkedList(DoublyLinkedList):
+    """A doubly linked list that uses a "swap" heuristic for searches.
+
+    Nodes are relinked rather than having their items swapped, so node handles keep
+    referring to the same items.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+    """
+
+    def access(self, node: DoublyNode) -> None:
+        """Swap node with the node before it, if any.
+
+        >>> linky = DoublySwapLinkedList([10, 20, 30, 40, 50, 60])
+        >>> linky.__contains__(40)
+        True
+        >>> linky.to_list()
+        [10, 20, 40, 30, 50, 60]
+        >>> linky.__contains__(10)
+        True
+        >>> linky.to_list()
+        [10, 20, 40, 30, 50, 60]
+        """
+        if node.prev is not self._header:
+            self.move_before(node, node.prev)
+
+
+################################################################################
+# Heuristic 3 (count)
+################################################################################
+@dataclass(eq=False)
+class DoublyCountNode(DoublyNode):
+    """A node in a DoublyCountLinkedList.
+
+    Instance Attributes:
+      - item: The data stored in this node.
+      - next: The next node in the list, if any.
+      - prev: The previous node in the list, if any.
+      - access_count: The number of times this node has been accessed (used by the count heuristic)
+    """
+    next: Optional[DoublyCountNode] = field(default=None, repr=False)
+    prev: Optional[DoublyCountNode] = field(default=None, repr=False)
+    access_count: int = 0
+
+
+class DoublyCountLinkedList(DoublyLinkedList):
+    """A doubly linked list that uses a "count" heuristic for searches.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+        - the access counts of the nodes are in non-increasing order
+    """
+    _node_type = DoublyCountNode
+
+    def access(self, node: DoublyCountNode) -> None:
+        """Increase the count of node and reorder the nodes in non-increasing count order.
+
+        Since the counts were already in order, only the nodes just before node need to
+        be checked.
+
+        >>> linky = DoublyCountLinkedList([10, 20, 30, 40, 50, 60])
+        >>> linky.__contains__(40)
+        True
+        >>> linky.to_list()
+        [40, 10, 20, 30, 50, 60]
+        >>> linky.__contains__(50)
+        True
+        >>> linky.to_list()
+        [40, 50, 10, 20, 30, 60]
+        """
+        node.access_count += 1
+
+        successor = node
+        while not (successor.prev is self._header
+                   or successor.prev.access_count >= node.access_count):
+            successor = successor.prev
+
+        self.move_before(node, successor)
+
+
+def compare_removal(size: int) -> tuple[float, float]:
+    """Return the number of seconds taken to remove every item of a list of the given size
+    in a random order, first by LinkedList.pop and then by DoublyLinkedList.remove_node.
+
+    The indices and node handles to remove are computed before timing starts.
+
+    Preconditions:
+        - size > 0
+    """
+    order = random.sample(range(size), size)
+
+    # The index in the shrinking list of each item in order
+    indices = []
+    remaining = list(range(size))
+    for item in order:
+        indices.append(remaining.index(item))
+        remaining.remove(item)
+
+    singly = LinkedList(range(size))
+    doubly = DoublyLinkedList(range(size))
+    handles = list(doubly.nodes())
+    to_remove = [handles[item] for item in order]
+
+    singly_time = timeit.timeit(lambda: [singly.pop(i) for i in indices], number=1)
+    doubly_time = timeit.timeit(lambda: [doubly.remove_node(n) for n in to_remove], number=1)
+    return singly_time, doubly_time
+
+
+def compare_relink(ll_class: type, doubly_class: type, size: int, num_accesses: int) \
+        -> tuple[float, float, float]:
+    """Return the number of seconds taken by num_accesses random successful accesses to
+    lists of the given size, in three ways:
+        - searching an ll_class list with __contains__
+        - searching a doubly_class list with __contains__
+        - calling access on node handles of a doubly_class list, which skips the search
+
+    Preconditions:
+        - ll_class is a heuristic subclass of LinkedList from a1_part1
+        - doubly_class is the DoublyLinkedList subclass using the same heuristic
+        - size > 0
+    """
+    accesses = [random.randrange(size) for _ in range(num_accesses)]
+    singly = ll_class(range(size))
+    doubly = doubly_class(range(size))
+    handled = doubly_class(range(size))
+    handles = list(handled.nodes())
+
+    singly_time = timeit.timeit(lambda: [item in singly for item in accesses], number=1)
+    doubly_time = timeit.timeit(lambda: [item in doubly for item in accesses], number=1)
+    handle_time = timeit.timeit(lambda: [handled.access(handles[item]) for item in accesses],
+                                number=1)
+    return singly_time, doubly_time, handle_time
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'disable': ['E1136'],
+        'extra-imports': ['a1_linked_list', 'a1_part1', 'random', 'timeit'],
+        'max-nested-blocks': 4
+    })
+
+    import python_ta.contracts
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+    doctest.testmod()
+
+    import a1_part1
+
+    for n in [1000, 5000]:
+        singly_secs, doubly_secs = compare_removal(n)
+        print(f'Remove {n} items: pop {singly_secs:.4f}s, '
+              f'remove_node {doubly_secs:.4f}s')
+
+    for singly_class, doubly_class in [
+            (a1_part1.MoveToFrontLinkedList, DoublyMoveToFrontLinkedList),
+            (a1_part1.SwapLinkedList, DoublySwapLinkedList),
+            (a1_part1.CountLinkedList, DoublyCountLinkedList)]:
+        singly_secs, doubly_secs, handle_secs = compare_relink(
+            singly_class, doubly_class, 1000, 5000)
+        print(f'{singly_class.__name__}: {singly_secs:.4f}s, '
+              f'{doubly_class.__name__}: {doubly_secs:.4f}s, '
+              f'by node handle: {handle_secs:.4f}s')
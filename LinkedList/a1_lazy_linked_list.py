@@ -0,0 +1,268 @@
+"""CSC111 Linked Lists: lazily materialized linked lists
+
+A LazyLinkedList does not consume its items iterable up front. Instead, it keeps an
+iterator over the items that have not been linked yet, and only creates the next _Node
+when a traversal (iteration, to_list, __getitem__, __contains__ or pop) walks past the
+last node created so far. This makes it possible to build a linked list from a large
+generator (or even an infinite one) without first holding every item in memory.
+"""
+from __future__ import annotations
+import timeit
+from collections import deque
+from collections.abc import Sequence, Set
+from typing import Any, Iterable, Iterator, Optional
+
+from a1_linked_list import LinkedList, _Node
+
+
+class LazyLinkedList(LinkedList):
+    """A linked list that links the items of its source iterable only as they are reached.
+
+    >>> from itertools import count
+    >>> lst = LazyLinkedList(count())
+    >>> lst[3]
+    3
+    >>> lst._size   # Only four nodes have been created so far
+    4
+    >>> 10 in lst
+    True
+    >>> lst.pop(0)
+    0
+    >>> lst[0]
+    1
+
+    Representation Invariants:
+        - self._size == number of nodes reachable from self._first
+        - (self._first is None) == (self._last is None)
+        - self._last is None or self._last.next is None
+        - self._source is not None or self._remaining == 0
+    """
+    # Private Instance Attributes:
+    #   - _source: An iterator over the items that have not been linked yet,
+    #              or None once it has been exhausted.
+    #   - _last: The last node linked so far, or None if no nodes have been linked.
+    #   - _size: The number of nodes linked so far.
+    #   - _remaining: The number of items left in _source, or None if this is unknown
+    #                 (e.g., when the source is a generator).
+    #   - _pending: Items appended while _source was not exhausted, in order. They are
+    #               linked after every item of _source.
+    _source: Optional[Iterator]
+    _pending: deque
+    _last: Optional[_Node]
+    _size: int
+    _remaining: Optional[int]
+
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
+
+        No items are consumed from items until they are needed. The length of items is
+        only used if it is a Sequence or Set, since computing the length of any other
+        iterable (e.g., another LazyLinkedList) may consume it.
+        """
+        self._first = None
+        self._last = None
+        self._size = 0
+        self._remaining = len(items) if isinstance(items, (Sequence, Set)) else None
+        self._source = iter(items)
+        self._pending = deque()
+
+    def _link(self, item: Any) -> _Node:
+        """Create a new node for item, link it after self._last, and return it.
+        """
+        new_node = _Node(item)
+
+        if self._last is None:
+            self._first = new_node
+        else:
+            self._last.next = new_node
+
+        self._last = new_node
+        self._size += 1
+        return new_node
+
+    def _pull(self) -> Optional[_Node]:
+        """Link the next item of the source (or, once the source has been exhausted, the
+        next pending appended item) to the end of this list and return its node.
+
+        Return None if there are no items left to link.
+        """
+        if self._source is not None:
+            try:
+                item = next(self._source)
+            except StopIteration:
+                self._source = None
+                self._remaining = 0
+            else:
+                if self._remaining is not None:
+                    self._remaining -= 1
+                return self._link(item)
+
+        if len(self._pending) > 0:
+            return self._link(self._pending.popleft())
+        return None
+
+    def _next(self, node: Optional[_Node]) -> Optional[_Node]:
+        """Return the node after node, or the first node if node is None.
+
+        Pull one item from the source if the requested node has not been linked yet.
+        Return None if there is no such node.
+        """
+        next_node = self._first if node is None else node.next
+
+        if next_node is None and node is self._last:
+            next_node = self._pull()
+        return next_node
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items of this linked list, in order.
+        """
+        curr = self._next(None)
+        while curr is not None:
+            yield curr.item
+            curr = self._next(curr)
+
+    def to_list(self) -> list:
+        """Return a built-in Python list containing the items of this linked list.
+
+        This consumes the rest of the source, so it must not be called on an infinite list.
+
+        >>> LazyLinkedList(x * x for x in range(4)).to_list()
+        [0, 1, 4, 9]
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        """Return the number of elements in this list.
+
+        The rest of the source is consumed only if its length is unknown.
+
+        >>> lst = LazyLinkedList(range(1000))
+        >>> len(lst), lst._size
+        (1000, 0)
+        >>> lst = LazyLinkedList(x for x in range(1000))
+        >>> len(lst), lst._size
+        (1000, 1000)
+        >>> inner = LazyLinkedList(iter([1, 2, 3]))
+        >>> outer = LazyLinkedList(inner)
+        >>> inner._size   # Constructing outer did not consume inner
+        0
+        """
+        if self._remaining is None:
+            while self._pull() is not None:
+                pass
+
+        return self._size + self._remaining + len(self._pending)
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether item is in this linked list.
+
+        Items of the source are linked only until item is found.
+        """
+        for list_item in self:
+            if list_item == item:
+                return True
+        return False
+
+    def __getitem__(self, i: int) -> Any:
+        """Return the item stored at index i in this linked list.
+
+        Raise an IndexError if index i is out of bounds.
+
+        Preconditions:
+            - i >= 0
+        """
+        curr = self._next(None)
+        curr_index = 0
+
+        while curr is not None:
+            if curr_index == i:
+                return curr.item
+
+            curr = self._next(curr)
+            curr_index = curr_index + 1
+
+        raise IndexError
+
+    def pop(self, i: int) -> Any:
+        """Remove and return the item at index i.
+
+        Raise IndexError if i >= len(self).
+
+        Preconditions:
+            - i >= 0
+
+        >>> lst = LazyLinkedList(iter([1, 2, 10, 200]))
+        >>> lst.pop(1)
+        2
+        >>> lst.to_list()
+        [1, 10, 200]
+        """
+        prev, curr = None, self._next(None)
+        curr_index = 0
+
+        while not (curr is None or curr_index == i):
+            prev, curr = curr, self._next(curr)
+            curr_index = curr_index + 1
+
+        if curr is None:
+            raise IndexError
+
+        if prev is None:
+            self._first = curr.next
+        else:
+            prev.next = curr.next
+
+        if curr is self._last:
+            self._last = prev
+
+        self._size -= 1
+        return curr.item
+
+    def append(self, item: Any) -> None:
+        """Add the given item to the end of this linked list.
+
+        If any items have not been linked yet, item is queued after them instead of being
+        linked immediately.
+
+        >>> lst = LazyLinkedList(iter([1, 2]))
+        >>> lst.append(3)
+        >>> lst._size
+        0
+        >>> lst.to_list()
+        [1, 2, 3]
+        """
+        if self._source is None and len(self._pending) == 0:
+            self._link(item)
+        else:
+            self._pending.append(item)
+
+
+def first_lookup_time(ll_class: type, size: int) -> float:
+    """Return the number of seconds it takes to build a list of the given class from a
+    generator of size items and then look up its first item.
+
+    Preconditions:
+        - ll_class is LinkedList or issubclass(ll_class, LinkedList)
+        - size > 0
+    """
+    return timeit.timeit(lambda: ll_class(x for x in range(size))[0], number=1)
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'disable': ['E1136'],
+        'extra-imports': ['a1_linked_list', 'collections', 'collections.abc', 'timeit'],
+        'max-nested-blocks': 4
+    })
+
+    import python_ta.contracts
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+    doctest.testmod()
+
+    for n in [100, 1000, 5000]:
+        print(f'{n} items: LinkedList {first_lookup_time(LinkedList, n):.6f}s, '
+              f'LazyLinkedList {first_lookup_time(LazyLinkedList, n):.6f}s')
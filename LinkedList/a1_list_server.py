@@ -0,0 +1,476 @@
+"""CSC111 Linked Lists: sharing one linked list between processes
+
+ListServer owns a single linked list (a LinkedList, any subclass of it, or a
+DoublyLinkedList, so that a heuristic list such as CountLinkedList keeps learning from
+every client) and serves it over a local Unix socket. ListClient is the matching asyncio client.
+
+Framing
+=======
+Every request and response is one frame: a fixed header packed with _HEADER, followed
+by a JSON-encoded payload.
+    - request header:  payload length, request id, operation code (an _OPS value)
+    - response header: payload length, request id, status code (_OK, _INDEX_ERROR, _ERROR)
+The request payload is the operation's argument and the response payload is its result
+(or an error message). Items must therefore be JSON values; tuples come back as lists.
+A request whose argument or result cannot be decoded or encoded gets an _ERROR response,
+without affecting the other requests on the connection. A frame whose payload is longer
+than _MAX_FRAME bytes gets an _ERROR response, after which the connection is closed (the
+rest of the stream cannot be trusted).
+
+Pipelining
+==========
+Clients may send any number of requests without waiting for their responses; responses
+carry the id of their request. The server handles, as one batch, every complete frame
+that has arrived on a connection by the time it reads from it, and writes all of that
+batch's responses with a single write.
+
+Unix sockets are not available on Windows.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from a1_linked_list import LinkedList
+
+_HEADER = struct.Struct('!IIB')
+
+
+def _index(arg: Any) -> int:
+    """Return arg if it is a valid list index (an int >= 0).
+
+    Raise TypeError if arg is not an int, and IndexError if it is negative. Index arguments
+    come straight from the socket, so the list methods' i >= 0 preconditions are checked
+    here instead of being trusted.
+
+    >>> _index(-1)
+    Traceback (most recent call last):
+    IndexError: negative index -1
+    """
+    if not isinstance(arg, int) or isinstance(arg, bool):
+        raise TypeError(f'index must be an int, not {type(arg).__name__}')
+    elif arg < 0:
+        raise IndexError(f'negative index {arg}')
+    else:
+        return arg
+
+
+# Operation codes, and how the server applies each one to its list
+_OPS = {'contains': 0, 'get': 1, 'pop': 2, 'append': 3}
+_HANDLERS: dict[int, Callable[[LinkedList, Any], Any]] = {
+    _OPS['contains']: lambda lst, arg: arg in lst,
+    _OPS['get']: lambda lst, arg: lst[_index(arg)],
+    _OPS['pop']: lambda lst, arg: lst.pop(_index(arg)),
+    _OPS['append']: lambda lst, arg: lst.append(arg)
+}
+
+# Response status codes
+_OK, _INDEX_ERROR, _ERROR = 0, 1, 2
+
+_READ_SIZE = 65536
+_MAX_FRAME = 1 << 20
+
+# The exceptions raised by json for a value that cannot be encoded or decoded
+# (RecursionError for very deeply nested values)
+_JSON_ERRORS = (TypeError, ValueError, RecursionError)
+
+
+def _frame(request_id: int, code: int, value: Any) -> bytes:
+    """Return the frame for the given request id, operation or status code, and value.
+    """
+    payload = json.dumps(value, separators=(',', ':')).encode()
+    return _HEADER.pack(len(payload), request_id, code) + payload
+
+
+def _parse_frames(buffer: bytearray) -> list[tuple[int, int, Optional[bytes]]]:
+    """Remove every complete frame from the front of buffer, and return their
+    (request id, code, undecoded payload) tuples in order.
+
+    An incomplete frame at the end of buffer is left in place. If a header announces a
+    payload longer than _MAX_FRAME, its tuple has a payload of None and is the last one
+    returned, and buffer is cleared: the connection should then be closed.
+
+    >>> buffer = bytearray(_frame(7, _OPS['get'], 3) + _frame(8, _OPS['pop'], 0)[:-1])
+    >>> _parse_frames(buffer)
+    [(7, 1, b'3')]
+    >>> len(buffer) == len(_frame(8, _OPS['pop'], 0)) - 1
+    True
+    >>> _parse_frames(bytearray(_HEADER.pack(2 ** 31, 9, _OPS['get'])))
+    [(9, 1, None)]
+    """
+    frames = []
+    start = 0
+    while len(buffer) - start >= _HEADER.size:
+        length, request_id, code = _HEADER.unpack_from(buffer, start)
+        if length > _MAX_FRAME:
+            frames.append((request_id, code, None))
+            buffer.clear()
+            return frames
+
+        end = start + _HEADER.size + length
+        if len(buffer) < end:
+            break
+
+        frames.append((request_id, code, bytes(buffer[start + _HEADER.size:end])))
+        start = end
+
+    del buffer[:start]
+    return frames
+
+
+class ListServer:
+    """An asyncio server that lets clients call contains, get, pop and append on one list.
+
+    Requests from all connections are applied to the list one at a time, in the order the
+    server reads them.
+
+    Preconditions:
+        - the served list has the LinkedList methods (__contains__, __getitem__, pop
+          and append)
+    """
+    # Private Instance Attributes:
+    #   - _lst: The linked list being served.
+    #   - _server: The underlying asyncio server, or None if it has not been started.
+    #   - _connections: A mapping from the task serving each open connection to the
+    #                   stream that writes to it.
+    _lst: LinkedList
+    _server: Optional[asyncio.AbstractServer]
+    _connections: dict[asyncio.Task, asyncio.StreamWriter]
+
+    def __init__(self, lst: LinkedList) -> None:
+        """Initialize a new (not yet started) server for lst.
+        """
+        self._lst = lst
+        self._server = None
+        self._connections = {}
+
+    async def start(self, path: str) -> None:
+        """Start accepting connections on a Unix socket at the given path.
+        """
+        self._server = await asyncio.start_unix_server(self._handle_connection, path)
+
+    async def close(self) -> None:
+        """Stop accepting connections, close the open ones, and wait for the server to close.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _execute(self, code: int, arg: Any) -> tuple[int, Any]:
+        """Apply the operation with the given code to the list, and return the response
+        status and value.
+        """
+        if code not in _HANDLERS:
+            return _ERROR, f'unknown operation {code}'
+
+        try:
+            return _OK, _HANDLERS[code](self._lst, arg)
+        except IndexError:
+            return _INDEX_ERROR, 'index out of range'
+        except Exception as error:  # reported to the client rather than killing the server
+            return _ERROR, repr(error)
+
+    def _respond(self, request_id: int, code: int, payload: Optional[bytes]) -> bytes:
+        """Decode the argument in payload, apply the operation with the given code to the
+        list, and return the response frame for request_id.
+
+        A payload that is too large (None), that is not valid JSON, or whose result cannot
+        be encoded as JSON, produces an _ERROR response.
+        """
+        if payload is None:
+            return _frame(request_id, _ERROR, f'frame larger than {_MAX_FRAME} bytes')
+
+        try:
+            arg = json.loads(payload)
+        except _JSON_ERRORS as error:
+            return _frame(request_id, _ERROR, f'malformed payload: {error!r}')
+
+        status, value = self._execute(code, arg)
+        try:
+            return _frame(request_id, status, value)
+        except _JSON_ERRORS as error:
+            return _frame(request_id, _ERROR, f'result cannot be encoded: {error!r}')
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one client connection until it is closed.
+        """
+        self._connections[asyncio.current_task()] = writer
+        buffer = bytearray()
+        oversized = False
+        try:
+            while not oversized:
+                data = await reader.read(_READ_SIZE)
+                if data == b'':
+                    break
+
+                buffer.extend(data)
+                frames = _parse_frames(buffer)
+                oversized = frames != [] and frames[-1][2] is None
+                responses = [self._respond(request_id, code, payload)
+                             for request_id, code, payload in frames]
+                if responses != []:
+                    writer.write(b''.join(responses))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            del self._connections[asyncio.current_task()]
+
+
+def _resolve(future: asyncio.Future, status: int, payload: Optional[bytes]) -> None:
+    """Set the result or exception of future from a response with the given status and
+    undecoded payload.
+    """
+    if payload is None:
+        future.set_exception(RuntimeError(f'response larger than {_MAX_FRAME} bytes'))
+        return
+
+    try:
+        value = json.loads(payload)
+    except _JSON_ERRORS as error:
+        future.set_exception(RuntimeError(f'malformed response: {error!r}'))
+        return
+
+    if status == _OK:
+        future.set_result(value)
+    elif status == _INDEX_ERROR:
+        future.set_exception(IndexError(value))
+    else:
+        future.set_exception(RuntimeError(value))
+
+
+class ListClient:
+    """An asyncio client for a ListServer.
+
+    Every method may be awaited concurrently (e.g., with asyncio.gather); the requests are
+    then pipelined over the one connection.
+    """
+    # Private Instance Attributes:
+    #   - _reader: The stream that responses are read from.
+    #   - _writer: The stream that requests are written to.
+    #   - _pending: A mapping from the id of each request that has not been answered yet
+    #               to the future for its response.
+    #   - _next_id: The id to use for the next request.
+    #   - _receiver: The task that reads responses and resolves the pending futures.
+    _reader: asyncio.StreamReader
+    _writer: asyncio.StreamWriter
+    _pending: dict[int, asyncio.Future]
+    _next_id: int
+    _receiver: asyncio.Task
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Initialize a new client using the given streams.
+
+        Client code should use ListClient.connect instead.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._next_id = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path: str) -> ListClient:
+        """Return a new client connected to the ListServer listening at the given path.
+        """
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        """Close the connection to the server.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            # The server had already dropped the connection
+            pass
+        await self._receiver
+
+    async def _receive(self) -> None:
+        """Read responses until the connection closes, resolving the matching futures.
+
+        Responses with unknown request ids are ignored. A response that cannot be decoded
+        fails only its own request, except that an oversized frame closes the connection.
+        """
+        buffer = bytearray()
+        oversized = False
+        try:
+            while not oversized:
+                data = await self._reader.read(_READ_SIZE)
+                if data == b'':
+                    break
+
+                buffer.extend(data)
+                for request_id, status, payload in _parse_frames(buffer):
+                    oversized = payload is None
+                    future = self._pending.pop(request_id, None)
+                    if future is not None and not future.done():
+                        # (A done future's caller cancelled the request.)
+                        _resolve(future, status, payload)
+        except ConnectionError:
+            pass
+        finally:
+            if oversized:
+                self._writer.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('connection to ListServer closed'))
+            self._pending.clear()
+
+    async def _request(self, operation: str, arg: Any) -> Any:
+        """Send a request for operation with the given argument, and return its result.
+        """
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) % 2 ** 32
+
+        # Encode first, so that an argument that is not JSON leaves nothing pending
+        frame = _frame(request_id, _OPS[operation], arg)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(frame)
+        await self._writer.drain()
+        return await future
+
+    async def contains(self, item: Any) -> bool:
+        """Return whether item is in the server's list.
+        """
+        return await self._request('contains', item)
+
+    async def get(self, i: int) -> Any:
+        """Return the item at index i of the server's list.
+
+        Raise an IndexError if index i is out of bounds.
+        """
+        return await self._request('get', i)
+
+    async def pop(self, i: int) -> Any:
+        """Remove and return the item at index i of the server's list.
+
+        Raise an IndexError if index i is out of bounds.
+        """
+        return await self._request('pop', i)
+
+    async def append(self, item: Any) -> None:
+        """Add the given item to the end of the server's list.
+        """
+        await self._request('append', item)
+
+
+def _client_worker(path: str, items: list, count: int, pipeline_depth: int,
+                   barrier: Any) -> tuple[list[float], float, float]:
+    """Send count contains requests for random items to the ListServer at path, keeping
+    up to pipeline_depth requests in flight, and return (the latency of each request in
+    seconds, the wall-clock start time, the wall-clock end time).
+
+    This runs in its own worker process (see load_test). It waits on barrier after
+    connecting, so that all workers start sending at the same time.
+    """
+    async def run() -> tuple[list[float], float, float]:
+        client = await ListClient.connect(path)
+        latencies = []
+
+        async def timed_request() -> None:
+            request_start = time.perf_counter()
+            await client.contains(random.choice(items))
+            latencies.append(time.perf_counter() - request_start)
+
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+        start = time.time()
+        for batch_start in range(0, count, pipeline_depth):
+            batch_size = min(pipeline_depth, count - batch_start)
+            await asyncio.gather(*(timed_request() for _ in range(batch_size)))
+        end = time.time()
+
+        await client.close()
+        return latencies, start, end
+
+    return asyncio.run(run())
+
+
+async def load_test(path: str, items: list, num_clients: int, num_requests: int,
+                    pipeline_depth: int) -> tuple[float, float, float]:
+    """Send num_requests contains requests for random items to the ListServer at path,
+    and return the (p50 latency in seconds, p99 latency in seconds, requests per second).
+
+    Each of num_clients clients runs in its own worker process with its own connection,
+    and keeps up to pipeline_depth requests in flight at a time. The requests are split
+    as evenly as possible between the clients. Requests per second is measured from
+    when the first client starts sending until the last one finishes.
+
+    The ListServer must be running in a different process from the workers, e.g. in the
+    event loop that awaits this coroutine.
+
+    Preconditions:
+        - items != []
+        - num_clients > 0 and num_requests >= num_clients and pipeline_depth > 0
+    """
+    counts = [num_requests // num_clients + (1 if i < num_requests % num_clients else 0)
+              for i in range(num_clients)]
+
+    loop = asyncio.get_running_loop()
+    with multiprocessing.Manager() as manager, \
+            ProcessPoolExecutor(max_workers=num_clients) as executor:
+        barrier = manager.Barrier(num_clients)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, _client_worker, path, items, count,
+                                 pipeline_depth, barrier)
+            for count in counts))
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    elapsed = max(result[2] for result in results) - min(result[1] for result in results)
+
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+    return p50, p99, len(latencies) / elapsed
+
+
+async def _run_load_test(ll_class: type, size: int) -> None:
+    """Serve an ll_class list of the given size from a temporary socket in this process,
+    and print the results of load tests against it from worker processes, with and
+    without pipelining.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'list.sock')
+        server = ListServer(ll_class(range(size)))
+        await server.start(path)
+
+        for num_clients, pipeline_depth in [(1, 1), (4, 1), (4, 32)]:
+            p50, p99, rate = await load_test(path, list(range(size)), num_clients, 20000,
+                                             pipeline_depth)
+            print(f'{ll_class.__name__}, {num_clients} client processes, '
+                  f'depth {pipeline_depth}: p50 {p50 * 1e6:.0f}us, p99 {p99 * 1e6:.0f}us, '
+                  f'{rate:.0f} requests/s')
+
+        await server.close()
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'disable': ['E1136'],
+        'extra-imports': ['a1_linked_list', 'a1_part1', 'asyncio', 'json', 'struct',
+                          'multiprocessing', 'concurrent.futures', 'os', 'random',
+                          'tempfile', 'time'],
+        'max-nested-blocks': 4
+    })
+
+    import doctest
+    doctest.testmod()
+
+    import a1_part1
+    asyncio.run(_run_load_test(a1_part1.CountLinkedList, 200))
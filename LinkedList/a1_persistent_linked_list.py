@@ -0,0 +1,374 @@
+"""CSC111 Linked Lists: persistent (structurally shared) snapshots
+
+A PersistentLinkedList never mutates a node once it has been linked into the list.
+Every mutating operation instead copies the nodes *before* the point of change
+("path copying") and links the copies to the unchanged suffix of the old list.
+Because of this, snapshot() only has to remember the current first node: it runs in
+O(1) time and shares every node with the writer until the writer replaces them.
+
+Sharing is not free: every copied node costs far more memory than a slot in a built-in
+list, so snapshots only use less memory than to_list copies when mutations happen near
+the front of the list. See memory_report.
+"""
+from __future__ import annotations
+import tracemalloc
+from typing import Any, Iterable, Iterator, Optional
+
+from a1_linked_list import LinkedList
+
+
+class _PersistentNode:
+    """A node in a PersistentLinkedList.
+
+    This is not a dataclass (unlike _Node) so that it can use __slots__, which makes
+    each node less than half the size of a _Node.
+
+    Instance Attributes:
+      - item: The data stored in this node.
+      - next: The next node in the list, if any.
+    """
+    __slots__ = ('item', 'next')
+    item: Any
+    next: Optional[_PersistentNode]
+
+    def __init__(self, item: Any, next_node: Optional[_PersistentNode] = None) -> None:
+        """Initialize a new node storing item, linked to next_node."""
+        self.item = item
+        self.next = next_node
+
+    def relinked(self, next_node: Optional[_PersistentNode]) -> _PersistentNode:
+        """Return a copy of this node that links to next_node instead."""
+        return _PersistentNode(self.item, next_node)
+
+
+class _PersistentCountNode(_PersistentNode):
+    """A node in a PersistentCountLinkedList.
+
+    Instance Attributes:
+      - item: The data stored in this node.
+      - next: The next node in the list, if any.
+      - access_count: The number of times this node has been accessed (used by the count heuristic)
+    """
+    __slots__ = ('access_count',)
+    next: Optional[_PersistentCountNode]
+    access_count: int
+
+    def __init__(self, item: Any, next_node: Optional[_PersistentCountNode] = None,
+                 access_count: int = 0) -> None:
+        """Initialize a new node storing item with the given count, linked to next_node."""
+        super().__init__(item, next_node)
+        self.access_count = access_count
+
+    def relinked(self, next_node: Optional[_PersistentCountNode]) -> _PersistentCountNode:
+        """Return a copy of this node that links to next_node instead."""
+        return _PersistentCountNode(self.item, next_node, self.access_count)
+
+
+def _path_copy(nodes: list, suffix: Optional[_PersistentNode]) -> Optional[_PersistentNode]:
+    """Return the first node of fresh copies of nodes, linked in order and ending in suffix.
+
+    The original nodes are not mutated. Return suffix if nodes is empty.
+    """
+    first = suffix
+    for node in reversed(nodes):
+        first = node.relinked(first)
+    return first
+
+
+def _prefix_to(first: Optional[_PersistentNode], item: Any) \
+        -> tuple[list, Optional[_PersistentNode]]:
+    """Return the nodes before the first node containing item, and that node.
+
+    The returned node is None if item does not appear in the list starting at first.
+    """
+    prefix, curr = [], first
+    while not (curr is None or curr.item == item):
+        prefix.append(curr)
+        curr = curr.next
+    return prefix, curr
+
+
+class LinkedListSnapshot(LinkedList):
+    """An immutable, point-in-time view of a PersistentLinkedList.
+
+    A snapshot shares its nodes with the list it was taken from. Later mutations of that
+    list do not change the items, order or length of the snapshot.
+
+    Snapshots are created by PersistentLinkedList.snapshot, not by client code.
+    """
+
+    def __init__(self, first: Optional[_PersistentNode]) -> None:
+        """Initialize a new snapshot whose items start at the given (shared) node.
+        """
+        self._first = first
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items of this snapshot, in order.
+        """
+        curr = self._first
+        while curr is not None:
+            yield curr.item
+            curr = curr.next
+
+    def pop(self, i: int) -> Any:
+        """Raise TypeError: snapshots cannot be mutated.
+        """
+        raise TypeError('LinkedListSnapshot is immutable')
+
+    def append(self, item: Any) -> None:
+        """Raise TypeError: snapshots cannot be mutated.
+        """
+        raise TypeError('LinkedListSnapshot is immutable')
+
+
+class PersistentLinkedList(LinkedList):
+    """A linked list whose mutations copy nodes instead of changing them.
+
+    >>> lst = PersistentLinkedList([1, 2, 3, 4])
+    >>> snap = lst.snapshot()
+    >>> lst.pop(1)
+    2
+    >>> lst.append(5)
+    >>> lst.to_list()
+    [1, 3, 4, 5]
+    >>> snap.to_list()
+    [1, 2, 3, 4]
+    >>> list(snap)
+    [1, 2, 3, 4]
+
+    Representation Invariants:
+        - no node reachable from _first is mutated after it has been linked into the list
+    """
+    # Private Class Attributes:
+    #   - _node_type: the type of node created by __init__ and append.
+    _first: Optional[_PersistentNode]
+    _node_type: type = _PersistentNode
+
+    def __init__(self, items: Iterable) -> None:
+        """Initialize a new linked list containing the given items.
+
+        Unlike LinkedList.__init__, this does not call append (which would copy the whole
+        list for every item).
+        """
+        self._first = None
+        for item in reversed(list(items)):
+            self._first = self._node_type(item, self._first)
+
+    def snapshot(self) -> LinkedListSnapshot:
+        """Return an immutable view of the current items of this list, in O(1) time.
+
+        >>> lst = PersistentLinkedList([10, 20])
+        >>> snap = lst.snapshot()
+        >>> lst.pop(0)
+        10
+        >>> snap.to_list(), lst.to_list()
+        ([10, 20], [20])
+        >>> snap._first.next is lst._first
+        True
+        """
+        return LinkedListSnapshot(self._first)
+
+    def __iter__(self) -> Iterator:
+        """Return an iterator over the items of this linked list, in order.
+        """
+        return iter(self.snapshot())
+
+    def pop(self, i: int) -> Any:
+        """Remove and return the item at index i.
+
+        The i nodes before index i are copied; the nodes after it are shared with the
+        previous version of this list.
+
+        Raise IndexError if i >= len(self).
+
+        Preconditions:
+            - i >= 0
+        """
+        prefix, curr = [], self._first
+        while not (curr is None or len(prefix) == i):
+            prefix.append(curr)
+            curr = curr.next
+
+        if curr is None:
+            raise IndexError
+
+        self._first = _path_copy(prefix, curr.next)
+        return curr.item
+
+    def append(self, item: Any) -> None:
+        """Add the given item to the end of this linked list.
+
+        Every existing node is copied, since the last one must link to the new node.
+        """
+        prefix, curr = [], self._first
+        while curr is not None:
+            prefix.append(curr)
+            curr = curr.next
+
+        self._first = _path_copy(prefix, self._node_type(item))
+
+
+class PersistentMoveToFrontLinkedList(PersistentLinkedList):
+    """A persistent linked list that uses a "move to front" heuristic for searches.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+    """
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether item is in this linked list.
+
+        If the item is found, move it to the front of this list.
+
+        >>> linky = PersistentMoveToFrontLinkedList([10, 20, 30, 40])
+        >>> snap = linky.snapshot()
+        >>> 30 in linky
+        True
+        >>> linky.to_list(), snap.to_list()
+        ([30, 10, 20, 40], [10, 20, 30, 40])
+        """
+        prefix, curr = _prefix_to(self._first, item)
+
+        if curr is None:
+            return False
+        elif prefix != []:
+            self._first = _path_copy([curr] + prefix, curr.next)
+        return True
+
+
+class PersistentSwapLinkedList(PersistentLinkedList):
+    """A persistent linked list that uses a "swap" heuristic for searches.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+    """
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether item is in this linked list.
+
+        If the item is found, swap it with the item before it, if any.
+
+        >>> linky = PersistentSwapLinkedList([10, 20, 30, 40])
+        >>> snap = linky.snapshot()
+        >>> 30 in linky
+        True
+        >>> linky.to_list(), snap.to_list()
+        ([10, 30, 20, 40], [10, 20, 30, 40])
+        """
+        prefix, curr = _prefix_to(self._first, item)
+
+        if curr is None:
+            return False
+        elif prefix != []:
+            self._first = _path_copy(prefix[:-1] + [curr, prefix[-1]], curr.next)
+        return True
+
+
+class PersistentCountLinkedList(PersistentLinkedList):
+    """A persistent linked list that uses a "count" heuristic for searches.
+
+    Representation Invariants:
+        - all items in this linked list are unique
+    """
+    _first: Optional[_PersistentCountNode]
+    _node_type = _PersistentCountNode
+
+    def __contains__(self, item: Any) -> bool:
+        """Return whether item is in this linked list.
+
+        If the item is found, increase its count and reorder the nodes in
+        non-increasing count order. Snapshots keep the counts they were taken with.
+
+        >>> linky = PersistentCountLinkedList([10, 20, 30, 40])
+        >>> snap = linky.snapshot()
+        >>> 40 in linky
+        True
+        >>> linky.to_list(), snap.to_list()
+        ([40, 10, 20, 30], [10, 20, 30, 40])
+        >>> snap._first.next.next.next.access_count
+        0
+        """
+        prefix, curr = _prefix_to(self._first, item)
+
+        if curr is None:
+            return False
+
+        counted = _PersistentCountNode(curr.item, None, curr.access_count + 1)
+        # counted moves before the first node in prefix with a strictly lower count
+        position = 0
+        while not (position == len(prefix)
+                   or prefix[position].access_count < counted.access_count):
+            position += 1
+
+        prefix.insert(position, counted)
+        self._first = _path_copy(prefix, curr.next)
+        return True
+
+
+def memory_report(size: int, num_snapshots: int, position: float = 0.5,
+                  ll_class: type = PersistentLinkedList) -> tuple[int, int]:
+    """Return the number of bytes allocated (and still in use) to keep num_snapshots
+    snapshots of a list alive, and the number of bytes needed to keep the same number of
+    to_list copies of an ordinary LinkedList (mutated in place) instead.
+
+    Snapshots are taken from a list of size items, with one pop between consecutive
+    snapshots. Each pop is at the given position, as a fraction of the list's length:
+    0.0 pops the first item (no nodes are copied) and 0.5 pops from the middle (about
+    half of the list is copied). Both measurements exclude the items and the original
+    list, which are shared by both approaches.
+
+    >>> shared, copied = memory_report(1000, 100, position=0.0)
+    >>> shared < copied
+    True
+    >>> shared, copied = memory_report(1000, 100, position=0.5)
+    >>> shared > copied
+    True
+
+    Preconditions:
+        - ll_class is PersistentLinkedList or issubclass(ll_class, PersistentLinkedList)
+        - 0 <= num_snapshots <= size
+        - 0.0 <= position < 1.0
+    """
+    items = list(range(size))
+
+    lst = ll_class(items)
+    tracemalloc.start()
+    snapshots = []
+    for _ in range(num_snapshots):
+        snapshots.append(lst.snapshot())
+        lst.pop(int(len(lst) * position))
+    shared = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    lst = LinkedList(items)
+    tracemalloc.start()
+    copies = []
+    for _ in range(num_snapshots):
+        copies.append(lst.to_list())
+        lst.pop(int(len(lst) * position))
+    copied = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return shared, copied
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'disable': ['E1136'],
+        'extra-imports': ['a1_linked_list', 'tracemalloc'],
+        'max-nested-blocks': 4
+    })
+
+    import python_ta.contracts
+    python_ta.contracts.check_all_contracts()
+
+    import doctest
+    doctest.testmod()
+
+    for n, k in [(1000, 10), (1000, 100), (10000, 100)]:
+        for pos in [0.0, 0.1, 0.5]:
+            shared, copied = memory_report(n, k, pos)
+            print(f'{k} snapshots of {n} items, pops at {pos:.0%}: {shared} bytes shared vs '
+                  f'{copied} bytes copied ({shared / copied:.1%} of full copies)')